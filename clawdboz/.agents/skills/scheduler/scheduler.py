@@ -31,34 +31,93 @@ JSON 格式规范：
 """
 
 import json
+import math
 import os
 import threading
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+try:
+    import orjson  # 可选依赖：安装后用于加速 JSON 读写
+except ImportError:
+    orjson = None
+
+
+def _resolve_data_dir(data_dir: str) -> str:
+    """规范化数据目录，处理相对路径，避免 WORKPLACE/WORKPLACE 问题"""
+    # 如果当前目录已经是 WORKPLACE，且传入的是 ./WORKPLACE，直接使用当前目录
+    if data_dir in ('./WORKPLACE', 'WORKPLACE') and os.path.basename(os.getcwd()) == 'WORKPLACE':
+        return os.getcwd()
+    # 将相对路径转换为绝对路径
+    return os.path.abspath(data_dir)
+
+
+def _is_timed(execute_time) -> bool:
+    """execute_time 是否为有限数字；NaN/Infinity 无法排序，按未设置时间处理"""
+    return isinstance(execute_time, (int, float)) and math.isfinite(execute_time)
+
+
+def _time_sort_key(task: dict) -> tuple:
+    """按 execute_time 排序的键，execute_time 不是有限数字的任务排在最后"""
+    execute_time = task.get('execute_time')
+    if _is_timed(execute_time):
+        return (0, execute_time)
+    return (1, 0)
 
 
 class TaskScheduler:
     """定时任务数据管理器 - 无调度功能，无时间解析"""
     
-    def __init__(self, data_dir: str = None):
-        self._lock = threading.Lock()
+    def __init__(self, data_dir: str = None, debug_pretty: bool = False):
+        """
+        Args:
+            data_dir: 数据目录，默认自动查找 WORKPLACE
+            debug_pretty: 是否以缩进格式写入 JSON（便于人工查看，默认紧凑格式）
+        """
+        self.debug_pretty = debug_pretty
+        
+        # 可重入锁：batch() 块持锁期间仍可调用 create_task 等公开方法
+        self._lock = threading.RLock()
         
         # 数据文件路径
         if data_dir is None:
-            data_dir = self._find_workplace_dir()
+            data_dir = os.path.abspath(self._find_workplace_dir())
         else:
-            # 处理相对路径，避免 WORKPLACE/WORKPLACE 问题
-            # 如果当前目录已经是 WORKPLACE，且传入的是 ./WORKPLACE，直接使用当前目录
-            if data_dir in ('./WORKPLACE', 'WORKPLACE') and os.path.basename(os.getcwd()) == 'WORKPLACE':
-                data_dir = os.getcwd()
-            else:
-                # 将相对路径转换为绝对路径
-                data_dir = os.path.abspath(data_dir)
+            data_dir = _resolve_data_dir(data_dir)
         
         self.data_dir = data_dir
         self.data_file = os.path.join(data_dir, 'scheduler_tasks.json')
         
-        os.makedirs(data_dir, exist_ok=True)
+        # 目录通常已存在，先 stat 一次，避免每次都走 mkdir + EEXIST
+        if not os.path.isdir(data_dir):
+            os.makedirs(data_dir, exist_ok=True)
+        
+        # 内存缓存：数据只在文件签名变化时重新解析
+        self._tasks: Optional[Dict[str, dict]] = None
+        self._task_id_counter = 0
+        self._extra_data: dict = {}
+        self._signature: Optional[tuple] = None
+        
+        # 按 execute_time 排序的索引（两个平行列表），随缓存一起维护；
+        # 时间列用连续的 double 数组存储，不为每个时间戳保留 float 对象。
+        # execute_time 不是有限数字的任务（外部写入的 None/''/NaN 等）单独记录
+        self._index_times = array('d')
+        self._index_ids: List[str] = []
+        self._untimed_ids: List[str] = []
+        # 任务 ID -> 插入顺序；execute_time 相同的任务按它排序，与文件中的先后顺序一致
+        self._index_seq: Dict[str, int] = {}
+        self._next_seq = 0
+        # chat_id -> 任务 ID（dict 当作有序集合使用），供 list_tasks(chat_id=...) 直接定位
+        self._chat_index: Dict[str, Dict[str, None]] = {}
+        
+        # 修改默认立即写入文件；只有在 batch() 块内才标记 dirty，退出块时统一落盘
+        self._dirty = False
+        self._batch_depth = 0
     
     def _find_workplace_dir(self) -> str:
         """查找工作目录"""
@@ -88,21 +147,206 @@ class TaskScheduler:
         
         return os.getcwd()
     
-    def _save_data(self, data: dict):
-        """原子写入 JSON 文件"""
-        with self._lock:
-            temp_file = self.data_file + '.tmp'
+    def _file_signature(self) -> Optional[tuple]:
+        """数据文件的 (mtime_ns, size, inode)，文件不存在时返回 None"""
+        try:
+            st = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _reload_if_stale(self) -> Dict[str, dict]:
+        """返回内存中的任务表，仅在文件被外部修改时重新解析
+        
+        bot 初始化、Agent 进程等可能直接改写 scheduler_tasks.json，
+        因此每次访问都用一次 stat 比对文件签名。batch() 块内已有未落盘的修改时以内存为准。
+        调用方需持有 self._lock。
+        """
+        if self._dirty:
+            return self._tasks
+        
+        signature = self._file_signature()
+        if self._tasks is None or signature != self._signature:
+            data = self._load_data()
+            self._task_id_counter = data.get('task_id_counter', 0)
+            self._tasks = data.get('tasks', {})
+            # 保留文件中其他顶层字段，写回时原样输出
+            self._extra_data = {
+                key: value for key, value in data.items()
+                if key not in ('task_id_counter', 'tasks')
+            }
+            self._signature = signature
+            self._rebuild_index()
+        return self._tasks
+    
+    def _rebuild_index(self):
+        """根据缓存数据重建 execute_time 索引（调用方需持有 self._lock）"""
+        timed = []
+        self._untimed_ids = []
+        self._chat_index = {}
+        self._index_seq = {}
+        for seq, (task_id, task) in enumerate(self._tasks.items()):
+            self._index_seq[task_id] = seq
+            self._chat_index.setdefault(task.get('chat_id'), {})[task_id] = None
+            execute_time = task.get('execute_time')
+            if _is_timed(execute_time):
+                timed.append((execute_time, task_id))
+            else:
+                self._untimed_ids.append(task_id)
+        
+        # 稳定排序：相同时间的任务保持文件中的先后顺序
+        timed.sort(key=lambda item: item[0])
+        self._index_times = array('d', [item[0] for item in timed])
+        self._index_ids = [item[1] for item in timed]
+        self._next_seq = len(self._tasks)
+    
+    def _index_add(self, task_id: str, task: dict):
+        """把任务加入索引，时间相同的任务按插入顺序排列（调用方需持有 self._lock）"""
+        seq = self._index_seq[task_id]
+        index_seq = self._index_seq
+        execute_time = task.get('execute_time')
+        if _is_timed(execute_time):
+            ids = self._index_ids
+            pos = bisect_left(self._index_times, execute_time)
+            hi = bisect_right(self._index_times, execute_time, pos)
+            while pos < hi and index_seq[ids[pos]] < seq:
+                pos += 1
+            self._index_times.insert(pos, execute_time)
+            ids.insert(pos, task_id)
+        else:
+            ids = self._untimed_ids
+            pos = len(ids)
+            while pos and index_seq[ids[pos - 1]] > seq:
+                pos -= 1
+            ids.insert(pos, task_id)
+    
+    def _index_remove(self, task_id: str, task: dict):
+        """把任务移出索引，task 需为修改前的状态（调用方需持有 self._lock）"""
+        execute_time = task.get('execute_time')
+        if _is_timed(execute_time):
+            pos = bisect_left(self._index_times, execute_time)
+            while self._index_ids[pos] != task_id:
+                pos += 1
+            del self._index_times[pos]
+            del self._index_ids[pos]
+        else:
+            self._untimed_ids.remove(task_id)
+    
+    def _save_data(self):
+        """标记内存缓存已修改；不在 batch() 块内时立即写入文件（调用方需持有 self._lock）"""
+        self._dirty = True
+        if not self._batch_depth:
+            self._flush_locked()
+    
+    def _flush_locked(self):
+        """原子写入 JSON 文件（调用方需持有 self._lock）"""
+        if not self._dirty:
+            return
+        
+        try:
+            signature = self._write_file()
+        except BaseException:
+            # 写入失败时丢弃内存中的修改，下次访问重新从文件加载，与直接读写文件的行为一致
+            self._tasks = None
+            self._dirty = False
+            raise
+        
+        self._dirty = False
+        self._signature = signature
+    
+    def _write_file(self) -> tuple:
+        """把内存缓存写入临时文件再替换数据文件，返回新文件的签名（调用方需持有 self._lock）
+        
+        签名取自临时文件的 fstat：rename 不改变 mtime/size/inode，而替换后再 stat 路径
+        可能读到其他进程刚写入的文件，把别人的修改误认作自己的，之后不再重新加载。
+        """
+        data = {
+            'task_id_counter': self._task_id_counter,
+            'tasks': self._tasks
+        }
+        data.update(self._extra_data)
+        
+        temp_file = self.data_file + '.tmp'
+        if orjson is not None:
+            # orjson 直接输出 UTF-8 字节，默认即为紧凑格式
+            option = orjson.OPT_INDENT_2 if self.debug_pretty else None
+            with open(temp_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+                f.flush()
+                os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+        else:
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            os.replace(temp_file, self.data_file)
+                if self.debug_pretty:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                else:
+                    json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+        os.replace(temp_file, self.data_file)
+        self._fsync_data_dir()
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _fsync_data_dir(self):
+        """同步目录项，确保 os.replace 后的新文件在崩溃后仍然可见（仅 POSIX）"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            dir_fd = os.open(self.data_dir, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
+    @contextmanager
+    def batch(self):
+        """批量修改：块内的多次修改只在退出块时写入一次文件
+        
+        块执行期间持有锁，块内修改的是内存缓存，不再检查文件是否被外部修改；
+        其他进程在此期间对文件的修改会在退出块时被覆盖，因此只应包住短小的连续修改。
+        块内抛出异常时丢弃所有未落盘的修改（包括外层 batch() 块中的），不写入文件。
+        
+        用法:
+            with scheduler.batch():
+                for item in items:
+                    scheduler.create_task(...)
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                # 回滚：下次访问重新从文件加载
+                self._tasks = None
+                self._dirty = False
+                raise
+            finally:
+                self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_locked()
+    
+    def flush(self):
+        """立即把 batch() 块内尚未落盘的修改写入文件"""
+        with self._lock:
+            self._flush_locked()
     
     def _load_data(self) -> dict:
-        """加载 JSON 文件"""
-        if not os.path.exists(self.data_file):
+        """加载 JSON 文件，文件不存在时返回空数据"""
+        # 直接 open 并捕获 FileNotFoundError，省去 exists 的额外 stat，也避免检查后文件被删的竞态
+        try:
+            if orjson is not None:
+                with open(self.data_file, 'rb') as f:
+                    return orjson.loads(f.read())
+            
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
             return {'task_id_counter': 0, 'tasks': {}}
-        
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
     
     def create_task(self, chat_id: str, description: str, execute_time: float, 
                     time_interval: int = None) -> str:
@@ -119,96 +363,130 @@ class TaskScheduler:
             task_id: 任务 ID
             
         Raises:
-            ValueError: 如果 execute_time 不是正数
+            ValueError: 如果 execute_time 不是有限的正数
         """
-        if execute_time <= 0:
+        # NaN/Infinity 在 orjson 和 json 下会写成不同的内容（null 或非法的 NaN），直接拒绝
+        if not math.isfinite(execute_time) or execute_time <= 0:
             raise ValueError("execute_time 必须是正数 UTC 时间戳")
         
-        data = self._load_data()
-        data['task_id_counter'] += 1
-        task_id = str(data['task_id_counter'])
-        
-        task = {
-            'id': task_id,
-            'chat_id': chat_id,
-            'execute_time': float(execute_time),
-            'description': description,
-            'status': 'pending'
-        }
-        
         if time_interval is not None and time_interval > 0:
-            task['time_interval'] = int(time_interval)
+            time_interval = int(time_interval)
+        else:
+            time_interval = None
         
-        data['tasks'][task_id] = task
-        self._save_data(data)
+        with self._lock:
+            tasks = self._reload_if_stale()
+            self._task_id_counter += 1
+            task_id = str(self._task_id_counter)
+            
+            task = {
+                'id': task_id,
+                'chat_id': chat_id,
+                'execute_time': float(execute_time),
+                'description': description,
+                'status': 'pending'
+            }
+            if time_interval is not None:
+                task['time_interval'] = time_interval
+            
+            tasks[task_id] = task
+            self._index_seq[task_id] = self._next_seq
+            self._next_seq += 1
+            self._index_add(task_id, task)
+            self._chat_index.setdefault(chat_id, {})[task_id] = None
+            self._save_data()
         
         return task_id
     
-    def get_task(self, task_id: str) -> Optional[dict]:
-        """获取单个任务"""
-        data = self._load_data()
-        task = data['tasks'].get(str(task_id))
-        return task.copy() if task else None
+    def get_task(self, task_id: str) -> Optional[Mapping]:
+        """获取单个任务（只读视图，需要修改或序列化时请用 dict(task)）"""
+        with self._lock:
+            task = self._reload_if_stale().get(str(task_id))
+            return MappingProxyType(task) if task else None
     
-    def list_tasks(self, chat_id: str = None, status: str = None) -> List[dict]:
-        """列出任务"""
-        data = self._load_data()
+    def list_tasks(self, chat_id: str = None, status: str = None) -> List[Mapping]:
+        """列出任务（元素为只读视图）"""
         tasks = []
         
-        for task in data['tasks'].values():
-            if chat_id and task['chat_id'] != chat_id:
-                continue
-            if status and task['status'] != status:
-                continue
-            tasks.append(task.copy())
+        with self._lock:
+            all_tasks = self._reload_if_stale()
+            if chat_id:
+                # 只取该聊天的任务，再按执行时间排序（无执行时间的排在最后）
+                task_ids = sorted(
+                    self._chat_index.get(chat_id, ()),
+                    key=lambda task_id: _time_sort_key(all_tasks[task_id])
+                )
+            else:
+                # 全局索引已按 execute_time 排好序，无需每次重新排序
+                task_ids = self._index_ids + self._untimed_ids
+            
+            for task_id in task_ids:
+                task = all_tasks[task_id]
+                if status and task['status'] != status:
+                    continue
+                tasks.append(MappingProxyType(task))
         
-        tasks.sort(key=lambda x: x['execute_time'])
         return tasks
     
     def update_task(self, task_id: str, **kwargs) -> bool:
         """更新任务字段"""
         allowed_fields = {'description', 'execute_time', 'time_interval', 'status'}
         
-        data = self._load_data()
-        task_id = str(task_id)
-        
-        if task_id not in data['tasks']:
-            return False
+        # 先校验再修改，避免校验失败时缓存中的任务只被改了一半
+        updates = {key: value for key, value in kwargs.items() if key in allowed_fields}
+        if 'execute_time' in updates:
+            execute_time = updates['execute_time']
+            if not math.isfinite(execute_time) or execute_time <= 0:
+                raise ValueError("execute_time 必须是正数")
+        interval = updates.get('time_interval')
+        if interval is not None and (not math.isfinite(interval) or interval <= 0):
+            raise ValueError("time_interval 必须是正数或 None")
         
-        task = data['tasks'][task_id]
+        task_id = str(task_id)
         
-        for key, value in kwargs.items():
-            if key not in allowed_fields:
-                continue
+        with self._lock:
+            tasks = self._reload_if_stale()
+            old_task = tasks.get(task_id)
             
-            if key == 'execute_time' and value <= 0:
-                raise ValueError("execute_time 必须是正数")
+            if old_task is None:
+                return False
             
-            if key == 'time_interval':
-                if value is None:
+            # 写时复制：之前返回的只读视图保持修改前的内容
+            task = dict(old_task)
+            for key, value in updates.items():
+                if key == 'time_interval' and value is None:
                     task.pop('time_interval', None)
                     continue
-                elif value <= 0:
-                    raise ValueError("time_interval 必须是正数或 None")
+                task[key] = value
+            tasks[task_id] = task
             
-            task[key] = value
-        
-        self._save_data(data)
+            if 'execute_time' in updates:
+                self._index_remove(task_id, old_task)
+                self._index_add(task_id, task)
+            self._save_data()
         return True
     
     def delete_task(self, task_id: str) -> bool:
         """删除任务"""
-        data = self._load_data()
         task_id = str(task_id)
         
-        if task_id not in data['tasks']:
-            return False
-        
-        del data['tasks'][task_id]
-        self._save_data(data)
+        with self._lock:
+            task = self._reload_if_stale().pop(task_id, None)
+            
+            if task is None:
+                return False
+            
+            self._index_remove(task_id, task)
+            del self._index_seq[task_id]
+            chat_ids = self._chat_index.get(task.get('chat_id'))
+            if chat_ids is not None:
+                chat_ids.pop(task_id, None)
+                if not chat_ids:
+                    del self._chat_index[task.get('chat_id')]
+            self._save_data()
         return True
     
-    def tick(self, current_time: float = None, window_start: float = None) -> List[dict]:
+    def tick(self, current_time: float = None, window_start: float = None) -> List[Mapping]:
         """
         心跳 tick - 检查并返回需要执行的任务
         
@@ -217,7 +495,7 @@ class TaskScheduler:
             window_start: 检查窗口起始时间
             
         Returns:
-            需要执行的任务列表
+            需要执行的任务列表（元素为只读视图）
         """
         if current_time is None:
             current_time = datetime.now(timezone.utc).timestamp()
@@ -230,28 +508,73 @@ class TaskScheduler:
         
         self._last_tick_time = current_time
         
-        data = self._load_data()
-        tasks = data.get('tasks', {})
-        
         pending_tasks = []
-        for task_data in tasks.values():
-            execute_time = task_data.get('execute_time')
-            status = task_data.get('status', 'pending')
+        with self._lock:
+            tasks = self._reload_if_stale()
             
-            if status != 'pending':
-                continue
+            # 未设置执行时间的任务每次 tick 都返回
+            for task_id in self._untimed_ids:
+                task = tasks[task_id]
+                if task.get('status', 'pending') != 'pending':
+                    continue
+                if task.get('execute_time') in (None, ''):
+                    pending_tasks.append(MappingProxyType(task))
             
-            if execute_time is None or execute_time == '':
-                pending_tasks.append(task_data.copy())
-            elif window_start <= execute_time <= current_time:
-                pending_tasks.append(task_data.copy())
+            pending_tasks.extend(self._window_tasks(window_start, current_time))
         
         return pending_tasks
+    
+    def _window_tasks(self, window_start: float, current_time: float) -> List[Mapping]:
+        """返回执行时间落在 [window_start, current_time] 内的 pending 任务（调用方需持有 self._lock）"""
+        # 通过二分查找只遍历窗口内的任务
+        lo = bisect_left(self._index_times, window_start)
+        hi = bisect_right(self._index_times, current_time)
+        tasks = self._tasks
+        
+        window = []
+        for task_id in self._index_ids[lo:hi]:
+            task = tasks[task_id]
+            if task.get('status', 'pending') == 'pending':
+                window.append(MappingProxyType(task))
+        return window
 
 
 # ==================== 工具函数（仅格式化，不解析） ====================
 
-def format_task_list(tasks: List[dict], tz_offset: int = 8) -> str:
+# 重复周期的展示单位：(上限秒数, 换算秒数, 单位)
+_INTERVAL_UNITS = (
+    (3600, 60, '分'),
+    (86400, 3600, '小时'),
+    (float('inf'), 86400, '天'),
+)
+
+# 任务类型图标：重复任务 / 一次性任务
+_ICON_RECURRING = "🔄"
+_ICON_ONCE = "⏰"
+
+# 状态展示：列表中只显示图标，详情中显示图标 + 文字
+_STATUS_EMOJI = {
+    'pending': '⏳',
+    'running': '▶️',
+    'completed': '✅',
+    'failed': '❌'
+}
+_STATUS_TEXT = {
+    'pending': '⏳ 等待执行',
+    'running': '▶️ 执行中',
+    'completed': '✅ 已完成',
+    'failed': '❌ 失败'
+}
+
+
+@lru_cache(maxsize=2048)
+def _format_timestamp(timestamp: float, tz_offset: int, fmt: str) -> str:
+    """按时区偏移格式化时间戳；同一批任务反复展示时直接命中缓存"""
+    tz = timezone(timedelta(hours=tz_offset))
+    return datetime.fromtimestamp(timestamp, tz).strftime(fmt)
+
+
+def format_task_list(tasks: List[Mapping], tz_offset: int = 8) -> str:
     """格式化任务列表为可读文本
     
     Args:
@@ -261,9 +584,6 @@ def format_task_list(tasks: List[dict], tz_offset: int = 8) -> str:
     if not tasks:
         return "暂无定时任务"
     
-    from datetime import timezone, timedelta
-    
-    tz = timezone(timedelta(hours=tz_offset))
     lines = ["📋 **定时任务列表**\n"]
     
     for task in tasks:
@@ -272,26 +592,18 @@ def format_task_list(tasks: List[dict], tz_offset: int = 8) -> str:
         exec_time = task['execute_time']
         is_recurring = task.get('time_interval') is not None
         
-        icon = "🔄" if is_recurring else "⏰"
-        dt = datetime.fromtimestamp(exec_time, tz)
-        time_str = dt.strftime("%m-%d %H:%M")
+        icon = _ICON_RECURRING if is_recurring else _ICON_ONCE
+        time_str = _format_timestamp(exec_time, tz_offset, "%m-%d %H:%M")
         
         repeat_info = ""
         if is_recurring:
             interval = task['time_interval']
-            if interval < 3600:
-                repeat_info = f" (每{interval//60}分)"
-            elif interval < 86400:
-                repeat_info = f" (每{interval//3600}小时)"
-            else:
-                repeat_info = f" (每{interval//86400}天)"
+            for limit, unit_seconds, unit in _INTERVAL_UNITS:
+                if interval < limit:
+                    repeat_info = f" (每{interval//unit_seconds}{unit})"
+                    break
         
-        status_emoji = {
-            'pending': '⏳',
-            'running': '▶️',
-            'completed': '✅',
-            'failed': '❌'
-        }.get(task['status'], '❓')
+        status_emoji = _STATUS_EMOJI.get(task['status'], '❓')
         
         lines.append(f"{icon} **#{task_id}** {time_str}{repeat_info} {status_emoji}")
         lines.append(f"   {desc[:30]}{'...' if len(desc) > 30 else ''}\n")
@@ -299,39 +611,30 @@ def format_task_list(tasks: List[dict], tz_offset: int = 8) -> str:
     return "\n".join(lines)
 
 
-def format_task_detail(task: dict, tz_offset: int = 8) -> str:
+def format_task_detail(task: Mapping, tz_offset: int = 8) -> str:
     """格式化任务详情
     
     Args:
         task: 任务字典
         tz_offset: 时区偏移（小时），默认北京时间+8
     """
-    from datetime import timezone, timedelta
-    
-    tz = timezone(timedelta(hours=tz_offset))
     task_id = task['id']
     desc = task['description']
     exec_time = task['execute_time']
     is_recurring = task.get('time_interval') is not None
     
-    dt = datetime.fromtimestamp(exec_time, tz)
-    time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
+    time_str = _format_timestamp(exec_time, tz_offset, "%Y-%m-%d %H:%M:%S")
     
     lines = [f"📋 **任务 #{task_id}**\n"]
     
     if is_recurring:
         interval = task['time_interval']
-        lines.append(f"🔄 **类型:** 重复任务 (每 {interval} 秒)")
+        lines.append(f"{_ICON_RECURRING} **类型:** 重复任务 (每 {interval} 秒)")
     else:
-        lines.append(f"⏰ **类型:** 一次性任务")
+        lines.append(f"{_ICON_ONCE} **类型:** 一次性任务")
     
     status = task['status']
-    status_text = {
-        'pending': '⏳ 等待执行',
-        'running': '▶️ 执行中',
-        'completed': '✅ 已完成',
-        'failed': '❌ 失败'
-    }.get(status, status)
+    status_text = _STATUS_TEXT.get(status, status)
     lines.append(f"**状态:** {status_text}")
     
     lines.append(f"📅 **执行时间:** {time_str} (UTC+{tz_offset})")
@@ -345,24 +648,32 @@ def format_task_detail(task: dict, tz_offset: int = 8) -> str:
     return "\n".join(lines)
 
 
-# 全局实例
-_scheduler: Optional[TaskScheduler] = None
+# 全局实例：按规范化后的绝对路径缓存，每个数据目录只有一个实例（各自维护内存缓存和锁）。
+# 不做淘汰：被淘汰后重新创建的实例会与仍在使用的旧实例各持一把锁，写入不再串行。
+_schedulers: Dict[str, TaskScheduler] = {}
+_default_data_dir: Optional[str] = None
+_schedulers_lock = threading.Lock()
 
 
 def get_scheduler(data_dir: str = None) -> TaskScheduler:
-    """获取全局调度器实例"""
-    global _scheduler
-    if _scheduler is None:
-        _scheduler = TaskScheduler(data_dir)
-    elif data_dir is not None:
-        # 处理相对路径，避免 WORKPLACE/WORKPLACE 问题
-        if data_dir in ('./WORKPLACE', 'WORKPLACE') and os.path.basename(os.getcwd()) == 'WORKPLACE':
-            data_dir = os.getcwd()
-        else:
-            data_dir = os.path.abspath(data_dir)
-        _scheduler.data_dir = data_dir
-        _scheduler.data_file = os.path.join(data_dir, 'scheduler_tasks.json')
-    return _scheduler
+    """获取数据目录对应的调度器实例，未指定目录时返回默认 WORKPLACE 的实例"""
+    global _default_data_dir
+    with _schedulers_lock:
+        if data_dir is None:
+            if _default_data_dir is None:
+                scheduler = TaskScheduler()
+                _default_data_dir = scheduler.data_dir
+                return _schedulers.setdefault(_default_data_dir, scheduler)
+            data_dir = _default_data_dir
+        
+        # 键均为绝对路径：bot 心跳每次传入同一个绝对路径，可直接命中，无需重新解析
+        scheduler = _schedulers.get(data_dir)
+        if scheduler is None:
+            data_dir = _resolve_data_dir(data_dir)
+            scheduler = _schedulers.get(data_dir)
+            if scheduler is None:
+                scheduler = _schedulers[data_dir] = TaskScheduler(data_dir)
+        return scheduler
 
 
 # ==================== 便捷函数 ====================
@@ -373,12 +684,12 @@ def create_task(chat_id: str, description: str, execute_time: float,
     return get_scheduler(data_dir).create_task(chat_id, description, execute_time, time_interval)
 
 
-def get_task(task_id: str, data_dir: str = None) -> Optional[dict]:
+def get_task(task_id: str, data_dir: str = None) -> Optional[Mapping]:
     """获取单个任务"""
     return get_scheduler(data_dir).get_task(task_id)
 
 
-def list_tasks(chat_id: str = None, status: str = None, data_dir: str = None) -> List[dict]:
+def list_tasks(chat_id: str = None, status: str = None, data_dir: str = None) -> List[Mapping]:
     """列出任务"""
     return get_scheduler(data_dir).list_tasks(chat_id, status)
 
@@ -393,6 +704,6 @@ def delete_task(task_id: str, data_dir: str = None) -> bool:
     return get_scheduler(data_dir).delete_task(task_id)
 
 
-def tick(current_time: float = None, window_start: float = None, data_dir: str = None) -> List[dict]:
+def tick(current_time: float = None, window_start: float = None, data_dir: str = None) -> List[Mapping]:
     """心跳 tick - 检查并返回需要执行的任务"""
     return get_scheduler(data_dir).tick(current_time, window_start)